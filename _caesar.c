@@ -0,0 +1,63 @@
+/*
+ * Caesar Cipher - Native Shift Kernel
+ * Optional branchless SWAR kernel used by caesar_cipher.py for
+ * medium-sized ASCII texts (32 KiB up to 512 KiB, see _NATIVE_MIN_LENGTH
+ * and _NATIVE_MAX_LENGTH).
+ *
+ * Build next to the Python files (loaded with ctypes when present):
+ *     cc -O3 -march=native -funroll-loops -shared -fPIC -o _caesar.so _caesar.c
+ */
+
+#include <stddef.h>
+#include <stdint.h>
+#include <string.h>
+
+#define LANES(b) ((uint64_t)(b) * 0x0101010101010101ULL)
+#define HIGH_BITS LANES(0x80)
+
+/*
+ * Shift a single byte. Folding the case bit with (c | 0x20) lets one
+ * unsigned comparison cover both 'a'-'z' and 'A'-'Z'.
+ */
+static inline uint8_t shift_byte(uint8_t c, unsigned shift)
+{
+    unsigned idx = (unsigned)((c | 0x20) - 'a');
+    unsigned is_letter = idx < 26u;
+    unsigned wraps = idx + shift >= 26u;
+    return (uint8_t)(c + is_letter * (shift - 26u * wraps));
+}
+
+/*
+ * Shift every ASCII letter of src by shift positions, writing n bytes to
+ * dst. src and dst may be the same buffer.
+ *
+ * src must only contain 7-bit ASCII and shift must be in [0, 25]. Eight
+ * bytes are processed per 64-bit word: with every lane below 0x80, adding
+ * (0x80 - k) to a lane sets its high bit exactly when the lane is >= k,
+ * and no lane can carry into its neighbour.
+ */
+void caesar_shift(const uint8_t *src, uint8_t *dst, size_t n, int shift)
+{
+    const uint64_t shift_lanes = LANES(shift);
+    const uint64_t wrap_at = LANES(0x80 - ('z' + 1) + shift);
+    size_t i = 0;
+
+    for (; i + 8 <= n; i += 8) {
+        uint64_t word, folded, letter, wraps, add, sub;
+
+        memcpy(&word, src + i, sizeof word);
+        folded = word | LANES(0x20);
+        /* folded >= 'a' and not folded >= 'z' + 1 */
+        letter = (folded + LANES(0x80 - 'a')) & ~(folded + LANES(0x80 - 'z' - 1)) & HIGH_BITS;
+        /* folded + shift >= 'z' + 1 */
+        wraps = (folded + wrap_at) & letter;
+        add = (letter >> 7) * 0xFF & shift_lanes;
+        sub = (wraps >> 7) * 26;
+        word = word + add - sub;
+        memcpy(dst + i, &word, sizeof word);
+    }
+
+    for (; i < n; i++) {
+        dst[i] = shift_byte(src[i], (unsigned)shift);
+    }
+}
@@ -6,114 +6,387 @@ A simple command-line Caesar cipher tool for encryption and decryption.
 
 import string
 import argparse
+import os
 import sys
+import ctypes
+from collections import Counter
+from functools import lru_cache
 
-class CaesarCipher:
+_PUNCT_SET = frozenset(string.punctuation)
+_ORD_A = ord('a')
+_ORD_BIG_A = ord('A')
+
+@lru_cache(maxsize=26)
+def _make_table(shift):
     """
-    A class to handle Caesar cipher encryption and decryption operations.
+    Build the str.translate table for a Caesar shift.
+    
+    Args:
+        shift (int): The shift value, already reduced modulo 26
+        
+    Returns:
+        dict: Translation table mapping each ASCII letter to its shifted letter
+    """
+    shifted_lower = string.ascii_lowercase[shift:] + string.ascii_lowercase[:shift]
+    shifted_upper = string.ascii_uppercase[shift:] + string.ascii_uppercase[:shift]
+    return str.maketrans(string.ascii_lowercase + string.ascii_uppercase,
+                         shifted_lower + shifted_upper)
+
+# Non-ASCII texts longer than this are shifted as a UTF-8 byte buffer
+_BYTES_THRESHOLD = 4096
+
+@lru_cache(maxsize=26)
+def _make_byte_table(shift):
     """
+    Build the bytes.translate table for a Caesar shift.
     
-    def __init__(self):
-        self.alphabet = string.ascii_lowercase
-        self.alphabet_upper = string.ascii_uppercase
+    Args:
+        shift (int): The shift value, already reduced modulo 26
+        
+    Returns:
+        bytes: 256-byte translation table for UTF-8 encoded text
+    """
+    shifted_lower = string.ascii_lowercase[shift:] + string.ascii_lowercase[:shift]
+    shifted_upper = string.ascii_uppercase[shift:] + string.ascii_uppercase[:shift]
+    return bytes.maketrans((string.ascii_lowercase + string.ascii_uppercase).encode('ascii'),
+                           (shifted_lower + shifted_upper).encode('ascii'))
+
+# ASCII texts in this length range use the native kernel from _caesar.c when
+# it has been built. Beyond the upper bound the extra buffer copies cost more
+# than the kernel saves over str.translate.
+_NATIVE_MIN_LENGTH = 1 << 15
+_NATIVE_MAX_LENGTH = 1 << 19
+
+@lru_cache(maxsize=None)
+def _load_native():
+    """
+    Load the optional _caesar.so shift kernel from next to this file.
     
-    def encrypt(self, text, shift):
-        """
-        Encrypt text using Caesar cipher with given shift.
+    Returns:
+        ctypes.CDLL: The loaded library, or None if it has not been built
+    """
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), '_caesar.so')
+    try:
+        lib = ctypes.CDLL(path)
+    except OSError:
+        return None
+    lib.caesar_shift.argtypes = (ctypes.c_char_p, ctypes.c_void_p, ctypes.c_size_t, ctypes.c_int)
+    lib.caesar_shift.restype = None
+    return lib
+
+def _process_text_native(lib, text, shift):
+    """
+    Shift ASCII text with the native SWAR kernel.
+    
+    Args:
+        lib (ctypes.CDLL): The loaded _caesar.so library
+        text (str): The text to process, containing only ASCII characters
+        shift (int): The shift value, already reduced modulo 26
         
-        Args:
-            text (str): The text to encrypt
-            shift (int): The number of positions to shift (1-25)
-            
-        Returns:
-            str: The encrypted text
-        """
-        return self._process_text(text, shift)
+    Returns:
+        str: The processed text
+    """
+    src = text.encode('ascii')
+    dst = bytearray(len(src))
+    lib.caesar_shift(src, (ctypes.c_char * len(dst)).from_buffer(dst), len(src), shift)
+    return dst.decode('ascii')
+
+# Decryption tables for every brute force shift, indexed by shift - 1
+_BRUTE_TABLES = tuple(_make_table(-shift % 26) for shift in range(1, 26))
+_BRUTE_BYTE_TABLES = tuple(_make_byte_table(-shift % 26) for shift in range(1, 26))
+
+# ASCII texts longer than this are analyzed from a NumPy byte histogram
+_HISTOGRAM_THRESHOLD = 4096
+
+@lru_cache(maxsize=None)
+def _load_numpy():
+    """
+    Import NumPy on first use so short texts never pay for the import.
     
-    def decrypt(self, text, shift):
-        """
-        Decrypt text using Caesar cipher with given shift.
+    Returns:
+        module: The numpy module, or None if it is not installed
+    """
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+def _analyze_histogram(text, hist, letter_frequency=True):
+    """
+    Compute analyze_text statistics for ASCII text from its byte histogram.
+    
+    Args:
+        text (str): The text to analyze, containing only ASCII characters
+        hist (list): Count of each ASCII code point (128 entries)
+        letter_frequency (bool): Whether to include the letter frequency
         
-        Args:
-            text (str): The text to decrypt
-            shift (int): The number of positions to shift (1-25)
-            
-        Returns:
-            str: The decrypted text
-        """
-        return self._process_text(text, -shift)
+    Returns:
+        dict: Statistics about the text
+    """
+    uppercase = sum(hist[_ORD_BIG_A:_ORD_BIG_A + 26])
+    lowercase = sum(hist[_ORD_A:_ORD_A + 26])
+    stats = {
+        'total_chars': len(text),
+        'letters': uppercase + lowercase,
+        'uppercase': uppercase,
+        'lowercase': lowercase,
+        'digits': sum(hist[48:58]),
+        # \t\n\v\f\r, the \x1c-\x1f separators and space, as str.isspace()
+        'spaces': sum(hist[9:14]) + sum(hist[28:33]),
+        'punctuation': sum(hist[33:48]) + sum(hist[58:65]) + sum(hist[91:97]) + sum(hist[123:127])
+    }
+    if letter_frequency:
+        stats['letter_frequency'] = {
+            chr(_ORD_A + i): hist[_ORD_A + i] + hist[_ORD_BIG_A + i]
+            for i in range(26)
+            if hist[_ORD_A + i] + hist[_ORD_BIG_A + i]
+        }
+    return stats
+
+def encrypt(text, shift):
+    """
+    Encrypt text using Caesar cipher with given shift.
     
-    def _process_text(self, text, shift):
-        """
-        Process text with the given shift value.
+    Args:
+        text (str): The text to encrypt
+        shift (int): The number of positions to shift (1-25)
         
-        Args:
-            text (str): The text to process
-            shift (int): The shift value (positive for encrypt, negative for decrypt)
-            
-        Returns:
-            str: The processed text
-        """
-        result = []
+    Returns:
+        str: The encrypted text
+    """
+    return _process_text(text, shift)
+
+def decrypt(text, shift):
+    """
+    Decrypt text using Caesar cipher with given shift.
+    
+    Args:
+        text (str): The text to decrypt
+        shift (int): The number of positions to shift (1-25)
         
-        for char in text:
-            if char.islower():
-                # Handle lowercase letters
-                shifted_pos = (ord(char) - ord('a') + shift) % 26
-                result.append(chr(shifted_pos + ord('a')))
-            elif char.isupper():
-                # Handle uppercase letters
-                shifted_pos = (ord(char) - ord('A') + shift) % 26
-                result.append(chr(shifted_pos + ord('A')))
-            else:
-                # Keep non-alphabetic characters unchanged
-                result.append(char)
+    Returns:
+        str: The decrypted text
+    """
+    return _process_text(text, -shift)
+
+def _process_text(text, shift):
+    """
+    Process text with the given shift value.
+    
+    Args:
+        text (str): The text to process
+        shift (int): The shift value (positive for encrypt, negative for decrypt)
         
-        return ''.join(result)
+    Returns:
+        str: The processed text
+    """
+    shift %= 26
+    if shift == 0:
+        # A full rotation leaves the text unchanged
+        return text
+    if _NATIVE_MIN_LENGTH <= len(text) < _NATIVE_MAX_LENGTH and text.isascii():
+        lib = _load_native()
+        if lib is not None:
+            return _process_text_native(lib, text, shift)
+    # str.translate has a fast path for pure ASCII text, but falls back to a
+    # per-character lookup otherwise. UTF-8 never reuses ASCII byte values
+    # inside multi-byte sequences, so the encoded bytes can be shifted as-is.
+    if len(text) > _BYTES_THRESHOLD and not text.isascii():
+        buf = text.encode('utf-8', 'surrogatepass')
+        return buf.translate(_make_byte_table(shift)).decode('utf-8', 'surrogatepass')
+    return text.translate(_make_table(shift))
+
+def _ascii_histogram(text):
+    """
+    Count each ASCII code point in text; other characters are ignored.
     
-    def analyze_text(self, text):
-        """
-        Analyze the given text and return statistics.
+    Args:
+        text (str): The text to count
         
-        Args:
-            text (str): The text to analyze
-            
-        Returns:
-            dict: Statistics about the text
-        """
-        stats = {
-            'total_chars': len(text),
-            'letters': sum(1 for c in text if c.isalpha()),
-            'uppercase': sum(1 for c in text if c.isupper()),
-            'lowercase': sum(1 for c in text if c.islower()),
-            'digits': sum(1 for c in text if c.isdigit()),
-            'spaces': sum(1 for c in text if c.isspace()),
-            'punctuation': sum(1 for c in text if c in string.punctuation),
-            'letter_frequency': {}
-        }
+    Returns:
+        list: 128 counts, indexed by code point
+    """
+    if len(text) > _HISTOGRAM_THRESHOLD and text.isascii():
+        np = _load_numpy()
+        if np is not None:
+            buf = np.frombuffer(text.encode('ascii'), dtype=np.uint8)
+            return np.bincount(buf, minlength=128).tolist()
+    return _counts_histogram(Counter(text))
+
+def _counts_histogram(counts):
+    """
+    Pick the ASCII code points out of a character Counter.
+    
+    Args:
+        counts (Counter): Count of each character
         
-        # Calculate letter frequency
-        for char in text.lower():
-            if char.isalpha():
-                stats['letter_frequency'][char] = stats['letter_frequency'].get(char, 0) + 1
+    Returns:
+        list: 128 counts, indexed by code point
+    """
+    return [counts.get(chr(i), 0) for i in range(128)]
+
+def analyze_text(text):
+    """
+    Analyze the given text and return statistics.
+    
+    Args:
+        text (str): The text to analyze
+        
+    Returns:
+        dict: Statistics about the text
+    """
+    if len(text) > _HISTOGRAM_THRESHOLD and text.isascii() and _load_numpy() is not None:
+        return _analyze_histogram(text, _ascii_histogram(text))
+    return _analyze_counts(text, Counter(text))
+
+def analyze_text_histogram(text):
+    """
+    Analyze text like analyze_text, but return the ASCII histogram instead of
+    the letter frequency. The text is only counted once.
+    
+    Args:
+        text (str): The text to analyze
+        
+    Returns:
+        tuple: (statistics without 'letter_frequency', 128 counts indexed by code point)
+    """
+    if text.isascii():
+        hist = _ascii_histogram(text)
+        return _analyze_histogram(text, hist, letter_frequency=False), hist
+    counts = Counter(text)
+    return _analyze_counts(text, counts, letter_frequency=False), _counts_histogram(counts)
+
+def _analyze_counts(text, counts, letter_frequency=True):
+    """
+    Compute analyze_text statistics from the count of each character.
+    
+    Args:
+        text (str): The text to analyze
+        counts (Counter): Count of each character in text
+        letter_frequency (bool): Whether to include the letter frequency
         
+    Returns:
+        dict: Statistics about the text
+    """
+    stats = {
+        'total_chars': len(text),
+        'letters': 0,
+        'uppercase': 0,
+        'lowercase': 0,
+        'digits': 0,
+        'spaces': 0,
+        'punctuation': 0
+    }
+    
+    # Classify each distinct character once, weighted by its count
+    for char, count in counts.items():
+        if char.isalpha():
+            stats['letters'] += count
+        if char.isupper():
+            stats['uppercase'] += count
+        if char.islower():
+            stats['lowercase'] += count
+        if char.isdigit():
+            stats['digits'] += count
+        if char.isspace():
+            stats['spaces'] += count
+        if char in _PUNCT_SET:
+            stats['punctuation'] += count
+    
+    if not letter_frequency:
         return stats
     
-    def brute_force_decrypt(self, text):
-        """
-        Attempt to decrypt text using all possible shifts (1-25).
+    # str.lower() is context sensitive outside ASCII (e.g. final sigma), so
+    # non-ASCII text is lowercased as a whole rather than per character
+    frequency = stats['letter_frequency'] = {}
+    if text.isascii():
+        for char, count in counts.items():
+            if char.isalpha():
+                lower = char.lower()
+                frequency[lower] = frequency.get(lower, 0) + count
+    else:
+        for char, count in Counter(text.lower()).items():
+            if char.isalpha():
+                frequency[char] = count
+    
+    return stats
+
+def shift_letter_frequency(letter_frequency, shift):
+    """
+    Shift the keys of an ASCII letter frequency the way encrypt shifts letters.
+    
+    Args:
+        letter_frequency (dict): Count of each lowercase letter 'a'-'z'
+        shift (int): The shift value (positive for encrypt, negative for decrypt)
         
-        Args:
-            text (str): The text to decrypt
-            
-        Returns:
-            list: List of tuples (shift, decrypted_text)
-        """
-        results = []
-        for shift in range(1, 26):
-            decrypted = self.decrypt(text, shift)
-            results.append((shift, decrypted))
-        return results
+    Returns:
+        dict: The letter frequency of the shifted text
+    """
+    return {
+        chr((ord(letter) - _ORD_A + shift) % 26 + _ORD_A): count
+        for letter, count in letter_frequency.items()
+    }
+
+def iter_brute_force_decrypt(text):
+    """
+    Lazily decrypt text with every possible shift (1-25), one at a time.
+    
+    Args:
+        text (str): The text to decrypt
+        
+    Yields:
+        tuple: (shift, decrypted_text)
+    """
+    # The shifts run serially on purpose: str/bytes.translate hold the GIL,
+    # so threads do not overlap, and shipping 25 copies of a large text back
+    # from worker processes costs more than translating them here.
+    if len(text) > _BYTES_THRESHOLD and not text.isascii():
+        # Encode once and reuse the buffer for all 25 shifts
+        buf = text.encode('utf-8', 'surrogatepass')
+        for shift, table in enumerate(_BRUTE_BYTE_TABLES, 1):
+            yield shift, buf.translate(table).decode('utf-8', 'surrogatepass')
+    else:
+        for shift, table in enumerate(_BRUTE_TABLES, 1):
+            yield shift, text.translate(table)
+
+def brute_force_decrypt(text):
+    """
+    Attempt to decrypt text using all possible shifts (1-25).
+    
+    Args:
+        text (str): The text to decrypt
+        
+    Returns:
+        list: List of tuples (shift, decrypted_text)
+    """
+    return list(iter_brute_force_decrypt(text))
+
+class CaesarCipher:
+    """
+    A class to handle Caesar cipher encryption and decryption operations.
+    The cipher itself is stateless and lives in the module-level functions.
+    """
+    
+    def encrypt(self, text, shift):
+        """Wrapper around the module-level encrypt()."""
+        return encrypt(text, shift)
+    
+    def decrypt(self, text, shift):
+        """Wrapper around the module-level decrypt()."""
+        return decrypt(text, shift)
+    
+    def _process_text(self, text, shift):
+        """Wrapper around the module-level _process_text()."""
+        return _process_text(text, shift)
+    
+    def analyze_text(self, text):
+        """Wrapper around the module-level analyze_text()."""
+        return analyze_text(text)
+    
+    def brute_force_decrypt(self, text):
+        """Wrapper around the module-level brute_force_decrypt()."""
+        return brute_force_decrypt(text)
     
     def interactive_mode(self):
         """
@@ -4,124 +4,130 @@ Caesar Cipher Server
 A Flask web server that provides Caesar cipher encryption and decryption services.
 """
 
-from flask import Flask, request, jsonify, send_from_directory
+from flask import Flask, Response, request, jsonify, send_from_directory
+from flask.json.provider import DefaultJSONProvider
 from flask_cors import CORS
-import string
+from werkzeug.exceptions import RequestEntityTooLarge
 import os
+import base64
+import struct
 import sys
+from functools import lru_cache
+
+from caesar_cipher import encrypt, decrypt, analyze_text, analyze_text_histogram, iter_brute_force_decrypt, shift_letter_frequency
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+class OrjsonProvider(DefaultJSONProvider):
+    """
+    JSON provider that encodes responses with orjson instead of the json module.
+    orjson rejects lone surrogates such as "\\ud800", which are valid JSON, so
+    decoding stays with the default provider and encoding falls back to it.
+    """
+    
+    def dumps(self, obj, **kwargs):
+        """Serialize obj to a JSON string, keeping keys sorted like the default provider."""
+        option = orjson.OPT_SORT_KEYS
+        if kwargs.get('indent'):
+            option |= orjson.OPT_INDENT_2
+        try:
+            return orjson.dumps(obj, default=self.default, option=option).decode('utf-8')
+        except orjson.JSONEncodeError:
+            return super().dumps(obj, **kwargs)
+
+# Longest text accepted by the API, in characters. The body limit allows for
+# the worst-case JSON encoding, 12 bytes per character (an escaped surrogate
+# pair such as "\ud83d\ude00"), so that any text within MAX_TEXT gets through;
+# larger bodies are refused by Werkzeug before the JSON is even parsed
+MAX_TEXT = int(os.environ.get('MAX_TEXT', 1 << 20))
 
 app = Flask(__name__)
+app.config['MAX_CONTENT_LENGTH'] = MAX_TEXT * 12 + 4096
 CORS(app)  # Enable CORS for all routes
+if orjson is not None:
+    app.json = OrjsonProvider(app)
+
+# Repeat submissions of short texts are answered from a cache. Longer texts are
+# recomputed so that a full cache stays around a few MB per worker.
+_CACHE_MAX_TEXT = 4096
 
-class CaesarCipher:
+def _process_response(text, shift, operation, include_stats):
     """
-    A class to handle Caesar cipher encryption and decryption operations.
+    Encrypt or decrypt text and optionally gather statistics.
+    
+    Args:
+        text (str): The text to process
+        shift (int): The number of positions to shift (1-25)
+        operation (str): Either "encrypt" or "decrypt"
+        include_stats (bool): Whether to add original and result statistics
+        
+    Returns:
+        dict: The JSON response body
     """
+    # Process the text
+    if operation == 'encrypt':
+        result = encrypt(text, shift)
+    else:
+        result = decrypt(text, shift)
     
-    def __init__(self):
-        self.alphabet = string.ascii_lowercase
-        self.alphabet_upper = string.ascii_uppercase
+    response = {
+        'result': result,
+        'original_text': text,
+        'shift': shift,
+        'operation': operation
+    }
+    if not include_stats:
+        return response
     
-    def encrypt(self, text, shift):
-        """
-        Encrypt text using Caesar cipher with given shift.
-        
-        Args:
-            text (str): The text to encrypt
-            shift (int): The number of positions to shift (1-25)
-            
-        Returns:
-            str: The encrypted text
-        """
-        return self._process_text(text, shift)
+    # Get text statistics
+    original_stats = analyze_text(text)
     
-    def decrypt(self, text, shift):
-        """
-        Decrypt text using Caesar cipher with given shift.
-        
-        Args:
-            text (str): The text to decrypt
-            shift (int): The number of positions to shift (1-25)
-            
-        Returns:
-            str: The decrypted text
-        """
-        return self._process_text(text, -shift)
+    if text.isascii():
+        # The cipher only permutes letters within their case, so every
+        # count carries over and just the letter frequency keys are shifted
+        letter_shift = shift if operation == 'encrypt' else -shift
+        result_stats = dict(original_stats)
+        result_stats['letter_frequency'] = shift_letter_frequency(original_stats['letter_frequency'], letter_shift)
+    else:
+        # Some non-ASCII letters lowercase to ASCII ones (e.g. the Kelvin
+        # sign) without being shifted, so count the result directly
+        result_stats = analyze_text(result)
     
-    def _process_text(self, text, shift):
-        """
-        Process text with the given shift value.
-        
-        Args:
-            text (str): The text to process
-            shift (int): The shift value (positive for encrypt, negative for decrypt)
-            
-        Returns:
-            str: The processed text
-        """
-        result = []
-        
-        for char in text:
-            if char.islower():
-                # Handle lowercase letters
-                shifted_pos = (ord(char) - ord('a') + shift) % 26
-                result.append(chr(shifted_pos + ord('a')))
-            elif char.isupper():
-                # Handle uppercase letters
-                shifted_pos = (ord(char) - ord('A') + shift) % 26
-                result.append(chr(shifted_pos + ord('A')))
-            else:
-                # Keep non-alphabetic characters unchanged
-                result.append(char)
-        
-        return ''.join(result)
+    response['stats'] = {
+        'original': original_stats,
+        'result': result_stats
+    }
+    return response
+
+def _analyze_response(text, raw):
+    """
+    Analyze text.
     
-    def analyze_text(self, text):
-        """
-        Analyze the given text and return statistics.
+    Args:
+        text (str): The text to analyze
+        raw (bool): Replace the letter frequency with the raw ASCII histogram
         
-        Args:
-            text (str): The text to analyze
-            
-        Returns:
-            dict: Statistics about the text
-        """
-        stats = {
-            'total_chars': len(text),
-            'letters': sum(1 for c in text if c.isalpha()),
-            'uppercase': sum(1 for c in text if c.isupper()),
-            'lowercase': sum(1 for c in text if c.islower()),
-            'digits': sum(1 for c in text if c.isdigit()),
-            'spaces': sum(1 for c in text if c.isspace()),
-            'punctuation': sum(1 for c in text if c in string.punctuation),
-            'letter_frequency': {}
+    Returns:
+        dict: The JSON response body
+    """
+    if not raw:
+        return {
+            'text': text,
+            'analysis': analyze_text(text)
         }
-        
-        # Calculate letter frequency
-        for char in text.lower():
-            if char.isalpha():
-                stats['letter_frequency'][char] = stats['letter_frequency'].get(char, 0) + 1
-        
-        return stats
     
-    def brute_force_decrypt(self, text):
-        """
-        Attempt to decrypt text using all possible shifts (1-25).
-        
-        Args:
-            text (str): The text to decrypt
-            
-        Returns:
-            list: List of tuples (shift, decrypted_text)
-        """
-        results = []
-        for shift in range(1, 26):
-            decrypted = self.decrypt(text, shift)
-            results.append((shift, decrypted))
-        return results
+    analysis, hist = analyze_text_histogram(text)
+    analysis['histogram_b64'] = base64.b64encode(struct.pack('<128Q', *hist)).decode('ascii')
+    return {
+        'text': text,
+        'analysis': analysis
+    }
 
-# Initialize the cipher
-cipher = CaesarCipher()
+_cached_process_response = lru_cache(maxsize=256)(_process_response)
+_cached_analyze_response = lru_cache(maxsize=256)(_analyze_response)
 
 @app.route('/')
 def index():
@@ -142,7 +148,8 @@ def process_caesar_cipher():
     {
         "text": "Hello World",
         "shift": 3,
-        "operation": "encrypt" or "decrypt"
+        "operation": "encrypt" or "decrypt",
+        "include_stats": false (optional, adds original and result statistics)
     }
     
     Returns:
@@ -157,43 +164,39 @@ def process_caesar_cipher():
         text = data.get('text', '')
         shift = data.get('shift', 3)
         operation = data.get('operation', 'encrypt')
+        include_stats = data.get('include_stats', False)
         
         # Validate input
         if not text:
             return jsonify({'error': 'Text is required'}), 400
         
-        if not isinstance(shift, int) or shift < 1 or shift > 25:
+        if not isinstance(text, str):
+            return jsonify({'error': 'Text must be a string'}), 400
+        
+        if len(text) > MAX_TEXT:
+            return jsonify({'error': f'Text must be at most {MAX_TEXT} characters'}), 413
+        
+        # bool is an int subclass, but true/false are not shift values
+        if isinstance(shift, bool) or not isinstance(shift, int) or shift < 1 or shift > 25:
             return jsonify({'error': 'Shift must be an integer between 1 and 25'}), 400
         
         if operation not in ['encrypt', 'decrypt']:
             return jsonify({'error': 'Operation must be either "encrypt" or "decrypt"'}), 400
         
-        # Process the text
-        if operation == 'encrypt':
-            result = cipher.encrypt(text, shift)
-        else:
-            result = cipher.decrypt(text, shift)
-        
-        # Get text statistics
-        original_stats = cipher.analyze_text(text)
-        result_stats = cipher.analyze_text(result)
+        if not isinstance(include_stats, bool):
+            return jsonify({'error': 'include_stats must be true or false'}), 400
         
-        return jsonify({
-            'result': result,
-            'original_text': text,
-            'shift': shift,
-            'operation': operation,
-            'stats': {
-                'original': original_stats,
-                'result': result_stats
-            }
-        })
+        if len(text) <= _CACHE_MAX_TEXT:
+            return jsonify(_cached_process_response(text, shift, operation, include_stats))
+        return jsonify(_process_response(text, shift, operation, include_stats))
         
+    except RequestEntityTooLarge:
+        return jsonify({'error': f'Request body must be at most {app.config["MAX_CONTENT_LENGTH"]} bytes'}), 413
     except Exception as e:
         return jsonify({'error': f'An error occurred: {str(e)}'}), 500
 
 @app.route('/api/analyze', methods=['POST'])
-def analyze_text():
+def analyze_endpoint():
     """
     Analyze text and return statistics.
     
@@ -202,6 +205,10 @@ def analyze_text():
         "text": "Hello World"
     }
     
+    Query parameters:
+        raw=1: Omit letter_frequency and return "histogram_b64" instead, the
+            base64 of 128 little-endian uint64 counts, one per ASCII code point
+    
     Returns:
         JSON response with text analysis
     """
@@ -216,18 +223,25 @@ def analyze_text():
         if not text:
             return jsonify({'error': 'Text is required'}), 400
         
-        stats = cipher.analyze_text(text)
+        if not isinstance(text, str):
+            return jsonify({'error': 'Text must be a string'}), 400
         
-        return jsonify({
-            'text': text,
-            'analysis': stats
-        })
+        if len(text) > MAX_TEXT:
+            return jsonify({'error': f'Text must be at most {MAX_TEXT} characters'}), 413
+        
+        raw = request.args.get('raw') == '1'
         
+        if len(text) <= _CACHE_MAX_TEXT:
+            return jsonify(_cached_analyze_response(text, raw))
+        return jsonify(_analyze_response(text, raw))
+        
+    except RequestEntityTooLarge:
+        return jsonify({'error': f'Request body must be at most {app.config["MAX_CONTENT_LENGTH"]} bytes'}), 413
     except Exception as e:
         return jsonify({'error': f'An error occurred: {str(e)}'}), 500
 
 @app.route('/api/brute-force', methods=['POST'])
-def brute_force_decrypt():
+def brute_force_endpoint():
     """
     Attempt to decrypt text using all possible shifts.
     
@@ -250,16 +264,27 @@ def brute_force_decrypt():
         if not text:
             return jsonify({'error': 'Text is required'}), 400
         
-        results = cipher.brute_force_decrypt(text)
+        # Errors raised while streaming can no longer become a JSON error
+        # response, so reject anything the cipher cannot process up front
+        if not isinstance(text, str):
+            return jsonify({'error': 'Text must be a string'}), 400
+        
+        if len(text) > MAX_TEXT:
+            return jsonify({'error': f'Text must be at most {MAX_TEXT} characters'}), 413
         
-        return jsonify({
-            'original_text': text,
-            'possible_decryptions': [
-                {'shift': shift, 'result': result} 
-                for shift, result in results
-            ]
-        })
+        # Stream one decryption at a time so only a single shifted copy of the
+        # text is alive at once, instead of all 25 plus the encoded response
+        def generate():
+            yield '{"original_text":' + app.json.dumps(text) + ',"possible_decryptions":['
+            for shift, result in iter_brute_force_decrypt(text):
+                separator = ',' if shift > 1 else ''
+                yield separator + app.json.dumps({'shift': shift, 'result': result})
+            yield ']}'
         
+        return Response(generate(), mimetype='application/json')
+        
+    except RequestEntityTooLarge:
+        return jsonify({'error': f'Request body must be at most {app.config["MAX_CONTENT_LENGTH"]} bytes'}), 413
     except Exception as e:
         return jsonify({'error': f'An error occurred: {str(e)}'}), 500
 
@@ -284,6 +309,11 @@ def internal_error(error):
 
 def main():
     """Main function to run the server."""
+    # The Flask development server runs in a single process, so CPU-bound work
+    # cannot use more than one core; production needs a multi-worker WSGI server
+    if os.environ.get('PRODUCTION') == '1':
+        raise SystemExit("❌ Use a WSGI server in production: gunicorn -w $(nproc) -k gthread --threads 4 wsgi:app")
+    
     print("🔐 Caesar Cipher Server Starting...")
     print("=" * 50)
     print("Features:")
@@ -0,0 +1,9 @@
+#!/usr/bin/env python3
+"""
+Caesar Cipher Server - WSGI Entry Point
+Exposes the Flask app for production servers such as gunicorn:
+
+    gunicorn -w $(nproc) -k gthread --threads 4 wsgi:app
+"""
+
+from caesar_cipher_server import app